@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 import re
+import string
 import threading
 from dataclasses import dataclass
-from typing import Any, Optional, Protocol
-
-import pythoncom  # type: ignore
-import wmi
+from operator import attrgetter
+from typing import Any, Iterator, Optional, Protocol
 
 from .protocol import UsbBaseDeviceInfo, UsbBaseDeviceProtocol, UsbDeviceId
 from .registry import RegistryDeviceUtil
+from .wmi_provider import get_wmi_provider
 
 
 class PnPEntity(Protocol):
@@ -31,41 +31,44 @@ class _ParsedUsbIds:
     serial_number: Optional[str]
 
 
+@dataclass(frozen=True, slots=True)
+class _UsbPnPScanResult:
+    entities: list[PnPEntity]
+    entity_index: dict[str, PnPEntity]
+    device_ids: list[UsbDeviceId]
+
+
 class UsbBaseDeviceService(UsbBaseDeviceProtocol):
-    _VID_PATTERN = re.compile(r"VID_([0-9A-Fa-f]{4})")
-    _PID_PATTERN = re.compile(r"PID_([0-9A-Fa-f]{4})")
+    _HEX_DIGITS = frozenset(string.hexdigits)
 
-    _thread_local: threading.local
-    _usb_pnp_entities_cache: Optional[list[PnPEntity]]
+    # Only the columns read by `PnPEntity` consumers are projected, which keeps the
+    # per-instance DCOM marshalling small.
+    _USB_PNP_ENTITY_WQL = (
+        "SELECT PNPDeviceID, Name, Manufacturer, Description, Caption, Service, PNPClass, "
+        "CompatibleID, HardwareID FROM Win32_PnPEntity "
+        "WHERE PNPClass = 'USB' OR PNPClass = 'DiskDrive'"
+    )
+
+    _cache_lock: threading.Lock
+    _usb_pnp_scan_cache: Optional[_UsbPnPScanResult]
 
     def __init__(self) -> None:
-        self._thread_local = threading.local()
-        self._usb_pnp_entities_cache = None
+        self._cache_lock = threading.Lock()
+        self._usb_pnp_scan_cache = None
 
     def _get_wmi_provider(self) -> Any:
-        provider = getattr(self._thread_local, "wmi_provider", None)
-        if provider is None:
-            pythoncom.CoInitialize()
-            provider = wmi.WMI()
-            setattr(self._thread_local, "wmi_provider", provider)
-        return provider
+        return get_wmi_provider()
 
     def refresh(self) -> None:
-        self._usb_pnp_entities_cache = None
+        with self._cache_lock:
+            self._usb_pnp_scan_cache = None
 
     def list_base_device_ids(self) -> list[UsbDeviceId]:
-        entities = self.get_usb_pnp_entities()
-        res = [UsbDeviceId(instance_id=e.PNPDeviceID) for e in entities]
-
-        res.sort(key=lambda d: d.instance_id.casefold())
-        return res
+        # The sorted IDs are stored with the scan cache; return a copy of them.
+        return list(self._get_usb_pnp_scan().device_ids)
 
     def get_base_device_info(self, device_id: UsbDeviceId) -> UsbBaseDeviceInfo:
-        entity: PnPEntity | None = None
-        for candidate in self.get_usb_pnp_entities():
-            if candidate.PNPDeviceID == device_id.instance_id:
-                entity = candidate
-                break
+        entity = self._get_usb_pnp_scan().entity_index.get(device_id.instance_id)
         if entity is None:
             raise FileNotFoundError(f"USB device not found: {device_id.instance_id}")
 
@@ -114,23 +117,41 @@ class UsbBaseDeviceService(UsbBaseDeviceProtocol):
         )
 
     def get_usb_pnp_entities(self) -> list[PnPEntity]:
-        if not self._usb_pnp_entities_cache:
-            self._usb_pnp_entities_cache = self._scan_usb_pnp_entities_uncached()
+        return self._get_usb_pnp_scan().entities
 
-        return self._usb_pnp_entities_cache
+    def _get_usb_pnp_scan(self) -> _UsbPnPScanResult:
+        # MainAreaStateManager runs refresh and eject as QThreadPool tasks that can overlap,
+        # so the whole scan result is populated under the lock.
+        with self._cache_lock:
+            if self._usb_pnp_scan_cache is None:
+                self._usb_pnp_scan_cache = self._scan_usb_pnp_uncached()
 
-    def _scan_usb_pnp_entities_uncached(self) -> list[PnPEntity]:
-        wmi_provider = self._get_wmi_provider()
-        candidates: list[PnPEntity] = []
-        candidates.extend(wmi_provider.Win32_PnPEntity(PNPClass="USB"))
-        candidates.extend(wmi_provider.Win32_PnPEntity(PNPClass="DiskDrive"))
+            return self._usb_pnp_scan_cache
 
+    def _scan_usb_pnp_uncached(self) -> _UsbPnPScanResult:
         entities: list[PnPEntity] = []
-        for candidate in candidates:
-            if self._is_usb_candidate(candidate):
-                entities.append(candidate)
+        entity_index: dict[str, PnPEntity] = {}
+        for entity in self._iter_usb_pnp_entities():
+            entities.append(entity)
+            entity_index[entity.PNPDeviceID] = entity
+
+        device_ids = [UsbDeviceId(instance_id=e.PNPDeviceID) for e in entities]
+        device_ids.sort(key=attrgetter("instance_id_cf"))
+
+        return _UsbPnPScanResult(
+            entities=entities,
+            entity_index=entity_index,
+            device_ids=device_ids,
+        )
 
-        return entities
+    def _iter_usb_pnp_entities(self) -> Iterator[PnPEntity]:
+        seen_instance_ids: set[str] = set()
+        for candidate in self._get_wmi_provider().query(self._USB_PNP_ENTITY_WQL):
+            if candidate.PNPDeviceID in seen_instance_ids:
+                continue
+            if self._is_usb_candidate(candidate):
+                seen_instance_ids.add(candidate.PNPDeviceID)
+                yield candidate
 
     def _is_usb_candidate(self, candidate: PnPEntity) -> bool:
         instance_id = str(getattr(candidate, "PNPDeviceID", "") or "")
@@ -154,28 +175,33 @@ class UsbBaseDeviceService(UsbBaseDeviceProtocol):
         return False
 
     def _parse_usb_ids(self, instance_id: str) -> _ParsedUsbIds:
-        vid_match = self._VID_PATTERN.search(instance_id)
-        vendor_id = vid_match.group(1).upper() if vid_match else None
-
-        pid_match = self._PID_PATTERN.search(instance_id)
-        product_id = pid_match.group(1).upper() if pid_match else None
-
-        serial_number: Optional[str] = None
         # Typical formats:
         # - USB\VID_XXXX&PID_YYYY\<serial or location string>
         # - USBSTOR\DISK&VEN_...\<serial or location string>
-        parts = instance_id.split("\\\\")
-        if len(parts) < 3:
-            parts = instance_id.split("\\")
-        if len(parts) >= 3 and parts[-1]:
-            serial_number = parts[-1]
+        parts = instance_id.replace("\\\\", "\\").split("\\", 2)
+        if len(parts) < 2:
+            return _ParsedUsbIds(vendor_id=None, product_id=None, serial_number=None)
+
+        hardware_part = parts[1]
+        serial_number = parts[2] if len(parts) == 3 and parts[2] else None
 
         return _ParsedUsbIds(
-            vendor_id=vendor_id,
-            product_id=product_id,
+            vendor_id=self._slice_hex_id(hardware_part, "VID_"),
+            product_id=self._slice_hex_id(hardware_part, "PID_"),
             serial_number=serial_number,
         )
 
+    def _slice_hex_id(self, text: str, prefix: str) -> Optional[str]:
+        start = text.find(prefix)
+        if start < 0:
+            return None
+
+        start += len(prefix)
+        value = text[start : start + 4]
+        if len(value) != 4 or not self._HEX_DIGITS.issuperset(value):
+            return None
+        return value.upper()
+
     def _parse_bus_port(
         self,
         location_information: Optional[str],
@@ -209,23 +235,23 @@ class UsbBaseDeviceService(UsbBaseDeviceProtocol):
         description: str,
         caption: str,
     ) -> tuple[Optional[str], Optional[float]]:
-        text = " ".join([t for t in [name, description, caption, service] if t])
-        compatible = " ".join(compatible_ids or [])
+        text = " ".join([t for t in [name, description, caption, service] if t]).upper()
+        compatible = " ".join(compatible_ids or []).upper()
 
         if (
-            "USB30" in compatible.upper()
+            "USB30" in compatible
             or "USBHUB3" in (service or "").upper()
-            or "SUPERSPEED" in text.upper()
-            or "3.0" in name.upper()
+            or "SUPERSPEED" in text
+            or "3.0" in name
         ):
             return "3.0", 5000.0
-        elif "SUPERSPEEDPLUS" in text.upper():
+        elif "SUPERSPEEDPLUS" in text:
             return "3.1", 10000.0
-        elif "HIGH-SPEED" in text.upper() or "HIGHSPEED" in text.upper():
+        elif "HIGH-SPEED" in text or "HIGHSPEED" in text:
             return "2.0", 480.0
-        elif "FULL-SPEED" in text.upper() or "FULLSPEED" in text.upper():
+        elif "FULL-SPEED" in text or "FULLSPEED" in text:
             return "1.1", 12.0
-        elif "LOW-SPEED" in text.upper() or "LOWSPEED" in text.upper():
+        elif "LOW-SPEED" in text or "LOWSPEED" in text:
             return "1.0", 1.5
         else:
             return None, None
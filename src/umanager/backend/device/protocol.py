@@ -17,6 +17,10 @@ class DeviceEjectResult:
 @dataclass(frozen=True, slots=True)
 class UsbDeviceId:
     instance_id: str
+    instance_id_cf: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "instance_id_cf", self.instance_id.casefold())
 
 
 @dataclass(frozen=True, slots=True)
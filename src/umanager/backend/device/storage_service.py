@@ -1,13 +1,10 @@
 from __future__ import annotations
 
-import threading
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Optional, Protocol
 
-import pythoncom  # type: ignore
-import wmi
-
 from .base_service import UsbBaseDeviceService
 from .protocol import (
     DeviceEjectResult,
@@ -17,9 +14,11 @@ from .protocol import (
     UsbVolumeInfo,
 )
 from .registry import RegistryDeviceUtil
+from .wmi_provider import get_wmi_provider
 
 
 class _WmiDiskDrive(Protocol):
+    DeviceID: str
     PNPDeviceID: str
 
 
@@ -28,10 +27,6 @@ class _PnPEntity(Protocol):
     HardwareID: Optional[list[str]]
 
 
-class _WmiDiskPartition(Protocol):
-    pass
-
-
 class _WmiLogicalDisk(Protocol):
     DeviceID: Optional[str]
     FileSystem: Optional[str]
@@ -43,43 +38,48 @@ class _WmiLogicalDisk(Protocol):
 @dataclass(frozen=True, slots=True)
 class _StorageScanResult:
     device_ids: list[UsbDeviceId]
+    instance_ids: set[str]
     volumes_by_instance_id: dict[str, list[UsbVolumeInfo]]
 
 
 class UsbStorageDeviceService(UsbStorageDeviceProtocol):
-    _thread_local: threading.local
+    _USB_DISK_DRIVE_WQL = (
+        "SELECT DeviceID, PNPDeviceID FROM Win32_DiskDrive WHERE InterfaceType = 'USB'"
+    )
+    # Removable (2) and local fixed (3) disks only: USB HDDs report 3, and reading Size/FreeSpace
+    # of network (4) or optical (5) drives can stall for seconds when they are unavailable.
+    _LOGICAL_DISK_WQL = (
+        "SELECT DeviceID, FileSystem, VolumeName, Size, FreeSpace FROM Win32_LogicalDisk "
+        "WHERE DriveType = 2 OR DriveType = 3"
+    )
+
     _base_device_service: UsbBaseDeviceService
     _usb_device_ids_cache: Optional[list[UsbDeviceId]]
+    _usb_instance_ids_cache: Optional[set[str]]
     _usb_volumes_map_cache: Optional[dict[str, list[UsbVolumeInfo]]]
-    _usb_disk_drives_cache: Optional[list[_WmiDiskDrive]]
 
     def __init__(self, base_device_service: UsbBaseDeviceService) -> None:
-        self._thread_local = threading.local()
         self._base_device_service = base_device_service
         self._usb_device_ids_cache = None
+        self._usb_instance_ids_cache = None
         self._usb_volumes_map_cache = None
-        self._usb_disk_drives_cache = None
 
     def _get_wmi_provider(self) -> Any:
-        provider = getattr(self._thread_local, "wmi_provider", None)
-        if provider is None:
-            pythoncom.CoInitialize()
-            provider = wmi.WMI()
-            setattr(self._thread_local, "wmi_provider", provider)
-        return provider
+        return get_wmi_provider()
 
     def refresh(self) -> None:
         self._base_device_service.refresh()
 
         self._usb_device_ids_cache = None
+        self._usb_instance_ids_cache = None
         self._usb_volumes_map_cache = None
-        self._usb_disk_drives_cache = None
 
     def list_storage_device_ids(self) -> list[UsbDeviceId]:
-        return self._get_usb_device_ids()
+        # The IDs are sorted once per scan; a copy keeps callers from mutating the cache.
+        return list(self._get_usb_device_ids())
 
     def get_storage_device_info(self, device_id: UsbDeviceId) -> UsbStorageDeviceInfo:
-        if not any(d.instance_id == device_id.instance_id for d in self._get_usb_device_ids()):
+        if device_id.instance_id not in self._get_usb_instance_ids():
             raise FileNotFoundError(f"USB storage device not found: {device_id.instance_id}")
 
         base = self._base_device_service.get_base_device_info(device_id)
@@ -87,7 +87,7 @@ class UsbStorageDeviceService(UsbStorageDeviceProtocol):
         return UsbStorageDeviceInfo(base=base, volumes=volumes)
 
     def eject_storage_device(self, device_id: UsbDeviceId) -> DeviceEjectResult:
-        if not any(d.instance_id == device_id.instance_id for d in self._get_usb_device_ids()):
+        if device_id.instance_id not in self._get_usb_instance_ids():
             raise FileNotFoundError(f"USB storage device not found: {device_id.instance_id}")
 
         result = RegistryDeviceUtil.request_device_eject(device_id.instance_id)
@@ -96,126 +96,166 @@ class UsbStorageDeviceService(UsbStorageDeviceProtocol):
         return result
 
     def _get_usb_device_ids(self) -> list[UsbDeviceId]:
-        if not self._usb_device_ids_cache:
-            scan = self._scan_usb_storage_devices_uncached()
-            self._usb_device_ids_cache = scan.device_ids
-            self._usb_device_ids_cache.sort(key=lambda d: d.instance_id.casefold())
-            self._usb_volumes_map_cache = scan.volumes_by_instance_id
+        if self._usb_device_ids_cache is None:
+            return self._load_usb_storage_devices().device_ids
 
         return self._usb_device_ids_cache
 
+    def _get_usb_instance_ids(self) -> set[str]:
+        if self._usb_instance_ids_cache is None:
+            return self._load_usb_storage_devices().instance_ids
+
+        return self._usb_instance_ids_cache
+
     def _get_usb_volumes_map(self) -> dict[str, list[UsbVolumeInfo]]:
-        if not self._usb_volumes_map_cache:
-            scan = self._scan_usb_storage_devices_uncached()
-            self._usb_volumes_map_cache = scan.volumes_by_instance_id
-            self._usb_device_ids_cache = scan.device_ids
-            self._usb_device_ids_cache.sort(key=lambda d: d.instance_id.casefold())
+        if self._usb_volumes_map_cache is None:
+            return self._load_usb_storage_devices().volumes_by_instance_id
 
         return self._usb_volumes_map_cache
 
-    def _get_usb_disk_drives(self) -> list[_WmiDiskDrive]:
-        if not self._usb_disk_drives_cache:
-            self._usb_disk_drives_cache = self._scan_usb_disk_drives_uncached()
+    def _load_usb_storage_devices(self) -> _StorageScanResult:
+        scan = self._scan_usb_storage_devices_uncached()
 
-        return self._usb_disk_drives_cache
+        self._usb_device_ids_cache = scan.device_ids
+        self._usb_instance_ids_cache = scan.instance_ids
+        self._usb_volumes_map_cache = scan.volumes_by_instance_id
+        return scan
 
     def _scan_usb_storage_devices_uncached(self) -> _StorageScanResult:
-        entities = self._base_device_service.get_usb_pnp_entities()
-
-        storage_instance_ids: list[str] = []
-        for entity in entities:
-            if self._is_usb_storage_pnp_entity(entity):
-                instance_id = entity.PNPDeviceID
-                storage_instance_ids.append(instance_id)
-
         device_ids: list[UsbDeviceId] = []
         volumes_by_instance_id: dict[str, list[UsbVolumeInfo]] = {}
+        for entity in self._base_device_service.get_usb_pnp_entities():
+            if self._is_usb_storage_pnp_entity(entity):
+                instance_id = entity.PNPDeviceID
+                device_ids.append(UsbDeviceId(instance_id=instance_id))
+                volumes_by_instance_id[instance_id] = []
 
-        disk_volume_map: dict[str, list[UsbVolumeInfo]] = {}
-        for disk in self._get_usb_disk_drives():
-            instance_id = disk.PNPDeviceID
-            disk_volume_map[instance_id] = self._get_volumes_for_disk(disk)
+        if volumes_by_instance_id:
+            volumes_by_disk = self._scan_usb_volumes_by_disk_uncached()
+            for disk in self._query_usb_disk_drives():
+                instance_id = disk.PNPDeviceID
+                if instance_id in volumes_by_instance_id:
+                    volumes_by_instance_id[instance_id] = volumes_by_disk.get(disk.DeviceID, [])
 
-        for instance_id in storage_instance_ids:
-            device_ids.append(UsbDeviceId(instance_id=instance_id))
-            volumes_by_instance_id[instance_id] = disk_volume_map.get(instance_id, [])
+        device_ids.sort(key=attrgetter("instance_id_cf"))
 
         return _StorageScanResult(
             device_ids=device_ids,
+            instance_ids=set(volumes_by_instance_id),
             volumes_by_instance_id=volumes_by_instance_id,
         )
 
     def _is_usb_storage_pnp_entity(self, entity: _PnPEntity) -> bool:
-        instance_id = entity.PNPDeviceID
-        if instance_id.upper().startswith("USBSTOR\\"):
+        if self._has_usbstor_prefix(entity.PNPDeviceID):
             return True
 
         hardware_ids = getattr(entity, "HardwareID", None) or []
         for hid in hardware_ids:
-            if str(hid).upper().startswith("USBSTOR\\"):
+            if self._has_usbstor_prefix(str(hid)):
                 return True
 
         return False
 
-    def _scan_usb_disk_drives_uncached(self) -> list[_WmiDiskDrive]:
-        return self._get_wmi_provider().Win32_DiskDrive(InterfaceType="USB")
+    @staticmethod
+    def _has_usbstor_prefix(instance_id: str) -> bool:
+        # Only the prefix is upper-cased, instead of copying the whole ID.
+        return instance_id[:8].upper() == "USBSTOR\\"
 
-    def _get_volumes_for_disk(self, disk: _WmiDiskDrive) -> list[UsbVolumeInfo]:
-        volumes: list[UsbVolumeInfo] = []
+    def _query_usb_disk_drives(self) -> list[_WmiDiskDrive]:
+        # query() already returns a full list. It is read once per scan, and the joined result
+        # is what gets cached, so the drives need no cache of their own.
+        return self._get_wmi_provider().query(self._USB_DISK_DRIVE_WQL)
 
+    def _scan_usb_volumes_by_disk_uncached(self) -> dict[str, list[UsbVolumeInfo]]:
+        # The two association classes and the logical disks are each read in one query and
+        # joined locally, instead of issuing associator queries per disk and per partition.
+        provider = self._get_wmi_provider()
         try:
-            partitions = disk.associators("Win32_DiskDriveToDiskPartition")  # type: ignore[attr-defined]
+            partition_links = provider.fetch_as_lists(
+                "Win32_DiskDriveToDiskPartition", ["Antecedent", "Dependent"]
+            )
+            logical_disk_links = provider.fetch_as_lists(
+                "Win32_LogicalDiskToPartition", ["Antecedent", "Dependent"]
+            )
+            logical_disks: list[_WmiLogicalDisk] = provider.query(self._LOGICAL_DISK_WQL)
         except Exception:
-            partitions = []
-
-        for part in partitions or []:
-            volumes.extend(self._get_volumes_for_partition(part))
+            return {}
 
-        volumes.sort(key=lambda v: (v.drive_letter or "").casefold())
-        return volumes
+        partitions_by_disk: dict[str, list[str]] = {}
+        for disk_path, partition_path in partition_links:
+            disk_id = self._parse_object_path_key(disk_path)
+            partitions_by_disk.setdefault(disk_id, []).append(
+                self._parse_object_path_key(partition_path)
+            )
 
-    def _get_volumes_for_partition(self, partition: _WmiDiskPartition) -> list[UsbVolumeInfo]:
-        logical_disks: list[_WmiLogicalDisk]
-        try:
-            logical_disks = list(
-                partition.associators("Win32_LogicalDiskToPartition")  # type: ignore[attr-defined]
+        logical_disk_ids_by_partition: dict[str, list[str]] = {}
+        for partition_path, logical_disk_path in logical_disk_links:
+            partition_id = self._parse_object_path_key(partition_path)
+            logical_disk_ids_by_partition.setdefault(partition_id, []).append(
+                self._parse_object_path_key(logical_disk_path)
             )
-        except Exception:
-            logical_disks = []
 
-        res: list[UsbVolumeInfo] = []
+        volumes_by_logical_disk_id: dict[str, UsbVolumeInfo] = {}
         for ld in logical_disks:
             drive = getattr(ld, "DeviceID", None)
             if drive:
-                mount_path = Path(f"{drive}\\")
-            else:
-                mount_path = None
-
-            total_bytes = self._parse_optional_int(getattr(ld, "Size", None))
-            free_bytes = self._parse_optional_int(getattr(ld, "FreeSpace", None))
-
-            res.append(
-                UsbVolumeInfo(
-                    drive_letter=drive,
-                    mount_path=mount_path,
-                    file_system=getattr(ld, "FileSystem", None),
-                    volume_label=getattr(ld, "VolumeName", None),
-                    total_bytes=total_bytes,
-                    free_bytes=free_bytes,
-                )
-            )
-
-        return res
+                volumes_by_logical_disk_id[drive] = self._to_volume_info(ld)
+
+        volumes_by_disk: dict[str, list[UsbVolumeInfo]] = {}
+        for disk_id, partition_ids in partitions_by_disk.items():
+            volumes: list[UsbVolumeInfo] = []
+            for partition_id in partition_ids:
+                for logical_disk_id in logical_disk_ids_by_partition.get(partition_id, []):
+                    volume = volumes_by_logical_disk_id.get(logical_disk_id)
+                    if volume is not None:
+                        volumes.append(volume)
+
+            volumes.sort(key=lambda v: (v.drive_letter or "").casefold())
+            volumes_by_disk[disk_id] = volumes
+
+        return volumes_by_disk
+
+    @staticmethod
+    def _parse_object_path_key(path: str) -> str:
+        # e.g. \\HOST\root\cimv2:Win32_DiskDrive.DeviceID="\\\\.\\PHYSICALDRIVE1"
+        _, _, key = path.partition("=")
+        if len(key) >= 2 and key[0] == key[-1] == '"':
+            key = key[1:-1]
+        return key.replace("\\\\", "\\")
+
+    def _to_volume_info(self, ld: _WmiLogicalDisk) -> UsbVolumeInfo:
+        drive = getattr(ld, "DeviceID", None)
+        if drive:
+            mount_path = Path(f"{drive}\\")
+        else:
+            mount_path = None
+
+        total_bytes = self._parse_optional_int(getattr(ld, "Size", None))
+        free_bytes = self._parse_optional_int(getattr(ld, "FreeSpace", None))
+
+        return UsbVolumeInfo(
+            drive_letter=drive,
+            mount_path=mount_path,
+            file_system=getattr(ld, "FileSystem", None),
+            volume_label=getattr(ld, "VolumeName", None),
+            total_bytes=total_bytes,
+            free_bytes=free_bytes,
+        )
 
     def _parse_optional_int(self, value: object) -> Optional[int]:
         if value is None:
             return None
         if isinstance(value, int):
             return value
+        # WMI returns uint64 values as strings. int() strips surrounding whitespace itself and
+        # raises ValueError for an empty string.
         try:
-            s = str(value).strip()
-            if not s:
-                return None
-            return int(s)
-        except Exception:
+            return int(value)  # type: ignore[arg-type]
+        except ValueError:
+            return None
+        except TypeError:
+            pass
+        try:
+            return int(str(value))
+        except ValueError:
             return None
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import pythoncom  # type: ignore
+import wmi
+
+_thread_local = threading.local()
+
+
+def get_wmi_provider() -> Any:
+    """Return the WMI connection shared by the current thread.
+
+    COM objects cannot be used across threads, so each thread initialises COM and opens a
+    connection on its first call. All device services on that thread then reuse it.
+    """
+
+    provider = getattr(_thread_local, "wmi_provider", None)
+    if provider is None:
+        pythoncom.CoInitialize()
+        provider = wmi.WMI()
+        setattr(_thread_local, "wmi_provider", provider)
+    return provider
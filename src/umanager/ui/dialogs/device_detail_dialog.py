@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QVBoxLayout
 
 from umanager.backend.device import UsbBaseDeviceInfo, UsbStorageDeviceInfo, UsbVolumeInfo
@@ -20,65 +22,29 @@ class DeviceDetailDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
-        for label, value in self._build_base_lines(base):
-            layout.addWidget(QLabel(f"{label}: {value}"))
-
+        lines = [f"{label}: {value}" for label, value in _build_base_lines(base)]
         if storage is not None:
-            for line in self._build_storage_lines(storage):
-                layout.addWidget(QLabel(line))
+            lines.extend(self._build_storage_lines(storage))
+
+        # 所有信息放在同一个纯文本标签中，避免每行各创建一个 QLabel。
+        details = QLabel("\n".join(lines), parent=self)
+        details.setTextFormat(Qt.TextFormat.PlainText)
+        layout.addWidget(details)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok, parent=self)
         buttons.accepted.connect(self.accept)
         layout.addWidget(buttons)
 
-    @staticmethod
-    def _fmt(val: object, default: str = "-") -> str:
-        return str(val) if val not in (None, "") else default
-
-    @staticmethod
-    def _fmt_hex(val: Optional[str]) -> str:
-        if val is None:
-            return "-"
-        if val.lower().startswith("0x"):
-            return val
-        return f"0x{val}"
-
-    @staticmethod
-    def _fmt_speed(speed: Optional[float]) -> str:
-        if speed is None:
-            return "-"
-        return f"{speed:.0f} Mbps"
-
-    @staticmethod
-    def _fmt_bytes(val: Optional[int]) -> str:
-        if val is None:
-            return "-"
-        return format_size(val)
-
-    def _build_base_lines(self, base: UsbBaseDeviceInfo) -> list[tuple[str, str]]:
-        return [
-            ("产品", self._fmt(base.product)),
-            ("制造商", self._fmt(base.manufacturer)),
-            ("序列号", self._fmt(base.serial_number)),
-            ("厂商 ID", self._fmt_hex(base.vendor_id)),
-            ("产品 ID", self._fmt_hex(base.product_id)),
-            ("USB 版本", self._fmt(base.usb_version)),
-            ("速度", self._fmt_speed(base.speed_mbps)),
-            ("总线号", self._fmt(base.bus_number)),
-            ("端口号", self._fmt(base.port_number)),
-            ("描述", self._fmt(base.description)),
-        ]
-
     def _build_storage_lines(self, storage: UsbStorageDeviceInfo) -> list[str]:
         lines: list[str] = []
         for idx, vol in enumerate(storage.volumes):
             prefix = f"卷 {idx + 1}"
             lines.append(prefix)
-            lines.append(f"  卷标: {self._fmt(vol.volume_label)}")
-            lines.append(f"  文件系统: {self._fmt(vol.file_system)}")
-            lines.append(f"  盘符: {self._fmt(self._format_mount(vol))}")
-            lines.append(f"  剩余容量: {self._fmt_bytes(vol.free_bytes)}")
-            lines.append(f"  总容量: {self._fmt_bytes(vol.total_bytes)}")
+            lines.append(f"  卷标: {_fmt(vol.volume_label)}")
+            lines.append(f"  文件系统: {_fmt(vol.file_system)}")
+            lines.append(f"  盘符: {_fmt(self._format_mount(vol))}")
+            lines.append(f"  剩余容量: {_fmt_bytes(vol.free_bytes)}")
+            lines.append(f"  总容量: {_fmt_bytes(vol.total_bytes)}")
         return lines
 
     @staticmethod
@@ -88,3 +54,47 @@ class DeviceDetailDialog(QDialog):
         if vol.mount_path:
             return str(vol.mount_path)
         return "-"
+
+
+def _fmt(val: object, default: str = "-") -> str:
+    return str(val) if val not in (None, "") else default
+
+
+@lru_cache(maxsize=1024)
+def _fmt_hex(val: Optional[str]) -> str:
+    if val is None:
+        return "-"
+    if val.lower().startswith("0x"):
+        return val
+    return f"0x{val}"
+
+
+@lru_cache(maxsize=1024)
+def _fmt_speed(speed: Optional[float]) -> str:
+    if speed is None:
+        return "-"
+    return f"{speed:.0f} Mbps"
+
+
+@lru_cache(maxsize=1024)
+def _fmt_bytes(val: Optional[int]) -> str:
+    if val is None:
+        return "-"
+    return format_size(val)
+
+
+@lru_cache(maxsize=128)
+def _build_base_lines(base: UsbBaseDeviceInfo) -> tuple[tuple[str, str], ...]:
+    # `UsbBaseDeviceInfo` 是不可变且可哈希的，重复打开同一设备的详情时直接复用结果。
+    return (
+        ("产品", _fmt(base.product)),
+        ("制造商", _fmt(base.manufacturer)),
+        ("序列号", _fmt(base.serial_number)),
+        ("厂商 ID", _fmt_hex(base.vendor_id)),
+        ("产品 ID", _fmt_hex(base.product_id)),
+        ("USB 版本", _fmt(base.usb_version)),
+        ("速度", _fmt_speed(base.speed_mbps)),
+        ("总线号", _fmt(base.bus_number)),
+        ("端口号", _fmt(base.port_number)),
+        ("描述", _fmt(base.description)),
+    )
@@ -126,4 +126,4 @@ class SidebarWidget(QWidget):
     @staticmethod
     def _device_sort_key(storage: UsbStorageDeviceInfo) -> tuple[str, str]:
         name = storage.base.product or storage.base.description or ""
-        return (name.casefold(), storage.base.id.instance_id.casefold())
+        return (name.casefold(), storage.base.id.instance_id_cf)
@@ -12,13 +12,16 @@ from PySide6 import QtCore
 class UsbDeviceChangeWatcher(QtCore.QObject):
     deviceChangeDetected = QtCore.Signal()
 
+    # 卷变更事件由 WMI 主动推送，等待超时只用于检查停止标志，因此可以取得较长。
+    _WATCH_TIMEOUT_MS = 30_000
+
     def __init__(self, *, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(parent)
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._started = False
 
-    def _run(self) -> None:
+    def _run(self, stop_event: threading.Event) -> None:
         pythoncom.CoInitialize()
         try:
             provider = wmi.WMI()
@@ -27,17 +30,19 @@ class UsbDeviceChangeWatcher(QtCore.QObject):
                 wmi_class="Win32_VolumeChangeEvent",
             )
 
-            while not self._stop_event.is_set():
+            while not stop_event.is_set():
                 try:
-                    _event = watcher(timeout_ms=250)
+                    _event = watcher(timeout_ms=self._WATCH_TIMEOUT_MS)
                 except wmi.x_wmi_timed_out:
                     continue
                 except Exception:
-                    if self._stop_event.is_set():
+                    if stop_event.is_set():
                         break
                     time.sleep(0.5)
                     continue
 
+                if stop_event.is_set():
+                    break
                 self.deviceChangeDetected.emit()
         finally:
             try:
@@ -49,20 +54,21 @@ class UsbDeviceChangeWatcher(QtCore.QObject):
         if self._started:
             return
         self._started = True
-        self._stop_event.clear()
+        # 每次启动使用新的停止标志，避免仍在等待中的旧线程被重新唤起。
+        self._stop_event = threading.Event()
         self._thread = threading.Thread(
-            target=self._run, name="UsbDeviceChangeWatcher", daemon=True
+            target=self._run,
+            args=(self._stop_event,),
+            name="UsbDeviceChangeWatcher",
+            daemon=True,
         )
         self._thread.start()
 
     def stop(self) -> None:
         if not self._started:
             return
+        # 不在 GUI 线程上 join：后台线程为守护线程，且持有本次启动的停止标志，
+        # 醒来后会丢弃迟到的事件并自行退出。
         self._stop_event.set()
-
-        thread = self._thread
-        if thread is not None and thread.is_alive():
-            thread.join(timeout=3.0)
-
         self._thread = None
         self._started = False
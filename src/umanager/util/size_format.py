@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal, Optional
 
 SizeSystem = Literal["binary", "decimal"]
 
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB", "EB")
+_BINARY_POW = tuple(1 << (10 * i) for i in range(len(_UNITS)))
+_DECIMAL_POW = tuple(1000**i for i in range(len(_UNITS)))
+
 
 @dataclass(frozen=True, slots=True)
 class SizeParts:
@@ -20,6 +26,7 @@ class SizeParts:
     unit: str
 
 
+@lru_cache(maxsize=4096)
 def to_size_parts(
     num_bytes: int | None,
     *,
@@ -46,22 +53,21 @@ def to_size_parts(
 
     raw = 0 if num_bytes is None else int(num_bytes)
 
-    base = 1024 if system == "binary" else 1000
-    units = ("B", "KB", "MB", "GB", "TB", "PB", "EB")
-
     sign = -1 if raw < 0 else 1
     n = abs(raw)
 
-    unit_index = 0
-    value = float(n)
-    while unit_index < len(units) - 1 and value >= base:
-        value /= base
-        unit_index += 1
+    # 按整数阈值直接定位单位，避免逐级做浮点除法。
+    if system == "binary":
+        unit_index = min(len(_UNITS) - 1, (n.bit_length() - 1) // 10) if n else 0
+        value = n / _BINARY_POW[unit_index]
+    else:
+        unit_index = bisect_right(_DECIMAL_POW, n, lo=1) - 1
+        value = n / _DECIMAL_POW[unit_index]
 
     value *= sign
 
     if decimals is None:
-        if units[unit_index] == "B":
+        if _UNITS[unit_index] == "B":
             decimals = 0
         elif abs(value) < 10:
             decimals = 1
@@ -73,9 +79,10 @@ def to_size_parts(
     else:
         value = round(value, decimals)
 
-    return SizeParts(bytes=raw, value=value, unit=units[unit_index])
+    return SizeParts(bytes=raw, value=value, unit=_UNITS[unit_index])
 
 
+@lru_cache(maxsize=4096)
 def format_size(
     num_bytes: int | None,
     *,
@@ -0,0 +1,3 @@
+# 集成测试目录下都是需要手动运行的 `if __name__ == "__main__"` 演示脚本，
+# 不包含 pytest 用例；跳过收集以免导入 PySide6.QtWidgets 等模块。
+collect_ignore_glob = ["umanager/test_*.py"]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+
+from umanager.backend.device import UsbBaseDeviceService
+
+
+@pytest.fixture(scope="module")
+def service() -> UsbBaseDeviceService:
+    """The ID parsing helpers do not touch WMI, so one instance serves the whole module."""
+    return UsbBaseDeviceService()
+
+
+@pytest.mark.parametrize(
+    ("instance_id", "vendor_id", "product_id", "serial_number"),
+    [
+        pytest.param(r"USB\VID_0781&PID_5581\4C530001", "0781", "5581", "4C530001", id="usb"),
+        pytest.param(
+            r"USB\\VID_0781&PID_5581\\4C530001", "0781", "5581", "4C530001", id="doubled_separators"
+        ),
+        pytest.param(r"USB\VID_abcd&PID_ef01\S1", "ABCD", "EF01", "S1", id="lowercase_hex"),
+        pytest.param(
+            r"USBSTOR\DISK&VEN_SANDISK&PROD_ULTRA\ABC&0", None, None, "ABC&0", id="missing_vid_pid"
+        ),
+        pytest.param(r"USB\VID_07G1&PID_55\S1", None, None, "S1", id="non_hex_and_short_ids"),
+        pytest.param(r"USB\VID_0781&PID_5581", "0781", "5581", None, id="no_serial"),
+        pytest.param("ROOT", None, None, None, id="no_separator"),
+    ],
+)
+def test_parse_usb_ids(
+    service: UsbBaseDeviceService,
+    instance_id: str,
+    vendor_id: Optional[str],
+    product_id: Optional[str],
+    serial_number: Optional[str],
+) -> None:
+    parsed = service._parse_usb_ids(instance_id)
+    assert parsed.vendor_id == vendor_id
+    assert parsed.product_id == product_id
+    assert parsed.serial_number == serial_number
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+
+from umanager.backend.device import UsbBaseDeviceService, UsbDeviceId, UsbStorageDeviceService
+
+_HOST = r"\\HOST\root\cimv2"
+_STICK = r"USBSTOR\DISK&VEN_SANDISK&PROD_ULTRA\4C530001&0"
+_CARD_READER = r"USBSTOR\DISK&VEN_GENERIC&PROD_SD\000000000001&0"
+_MOUSE = r"USB\VID_046D&PID_C52B\5&1A2B3C4D&0&2"
+
+
+def _disk_path(index: int) -> str:
+    return _HOST + rf':Win32_DiskDrive.DeviceID="\\\\.\\PHYSICALDRIVE{index}"'
+
+
+def _partition_path(disk: int, partition: int) -> str:
+    return _HOST + f':Win32_DiskPartition.DeviceID="Disk #{disk}, Partition #{partition}"'
+
+
+def _logical_disk_path(drive: str) -> str:
+    return _HOST + f':Win32_LogicalDisk.DeviceID="{drive}"'
+
+
+def _logical_disk(drive: str, size: Optional[str] = "1024", free: Optional[str] = "512") -> Any:
+    return SimpleNamespace(
+        DeviceID=drive, FileSystem="FAT32", VolumeName=f"VOL_{drive[0]}", Size=size, FreeSpace=free
+    )
+
+
+def _pnp_entity(instance_id: str, pnp_class: str) -> Any:
+    return SimpleNamespace(
+        PNPDeviceID=instance_id,
+        Name=None,
+        Manufacturer=None,
+        Description=None,
+        Caption=None,
+        Service=None,
+        PNPClass=pnp_class,
+        CompatibleID=None,
+        HardwareID=None,
+    )
+
+
+def _disk_drive(index: int, instance_id: str) -> Any:
+    return SimpleNamespace(DeviceID=rf"\\.\PHYSICALDRIVE{index}", PNPDeviceID=instance_id)
+
+
+class FakeWmiProvider:
+    """Serves canned association rows and query results instead of a live WMI connection."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[list[str]]] = {}
+        self.rows: dict[str, list[Any]] = {}
+        self.raise_on_fetch: Optional[Exception] = None
+
+    def fetch_as_lists(self, wmi_class: str, fields: list[str]) -> list[list[str]]:
+        if self.raise_on_fetch is not None:
+            raise self.raise_on_fetch
+        return self.lists.get(wmi_class, [])
+
+    def query(self, wql: str) -> list[Any]:
+        return self.rows.get(wql, [])
+
+
+@pytest.fixture
+def provider() -> FakeWmiProvider:
+    return FakeWmiProvider()
+
+
+@pytest.fixture
+def service(provider: FakeWmiProvider) -> UsbStorageDeviceService:
+    base = UsbBaseDeviceService()
+    base._get_wmi_provider = lambda: provider  # type: ignore[method-assign]
+    service = UsbStorageDeviceService(base)
+    service._get_wmi_provider = lambda: provider  # type: ignore[method-assign]
+    return service
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        pytest.param(_disk_path(1), r"\\.\PHYSICALDRIVE1", id="escaped_disk_key"),
+        pytest.param(_partition_path(1, 0), "Disk #1, Partition #0", id="partition_key"),
+        pytest.param(_logical_disk_path("E:"), "E:", id="logical_disk_key"),
+        pytest.param("Win32_LogicalDisk.DeviceID=E:", "E:", id="unquoted_key"),
+        pytest.param("Win32_LogicalDisk", "", id="no_key"),
+    ],
+)
+def test_parse_object_path_key(path: str, expected: str) -> None:
+    assert UsbStorageDeviceService._parse_object_path_key(path) == expected
+
+
+def test_scan_volumes_joins_partitions_per_disk(
+    service: UsbStorageDeviceService, provider: FakeWmiProvider
+) -> None:
+    provider.lists["Win32_DiskDriveToDiskPartition"] = [
+        [_disk_path(1), _partition_path(1, 0)],
+        [_disk_path(1), _partition_path(1, 1)],
+        [_disk_path(2), _partition_path(2, 0)],
+    ]
+    provider.lists["Win32_LogicalDiskToPartition"] = [
+        [_partition_path(1, 0), _logical_disk_path("F:")],
+        [_partition_path(1, 1), _logical_disk_path("E:")],
+    ]
+    provider.rows[UsbStorageDeviceService._LOGICAL_DISK_WQL] = [
+        _logical_disk("E:"),
+        _logical_disk("F:"),
+        _logical_disk("C:"),
+    ]
+
+    volumes_by_disk = service._scan_usb_volumes_by_disk_uncached()
+
+    assert set(volumes_by_disk) == {r"\\.\PHYSICALDRIVE1", r"\\.\PHYSICALDRIVE2"}
+    # Volumes are ordered by drive letter, not by partition index.
+    disk1 = volumes_by_disk[r"\\.\PHYSICALDRIVE1"]
+    assert [v.drive_letter for v in disk1] == ["E:", "F:"]
+    assert disk1[0].volume_label == "VOL_E"
+    assert disk1[0].total_bytes == 1024
+    assert disk1[0].free_bytes == 512
+    # A partition without a logical disk still yields an (empty) entry for its disk.
+    assert volumes_by_disk[r"\\.\PHYSICALDRIVE2"] == []
+
+
+def test_scan_storage_devices_joins_disks_to_pnp_entities(
+    service: UsbStorageDeviceService, provider: FakeWmiProvider
+) -> None:
+    provider.rows[UsbBaseDeviceService._USB_PNP_ENTITY_WQL] = [
+        _pnp_entity(_STICK, "DiskDrive"),
+        _pnp_entity(_MOUSE, "USB"),
+        _pnp_entity(_CARD_READER, "DiskDrive"),
+    ]
+    provider.rows[UsbStorageDeviceService._USB_DISK_DRIVE_WQL] = [
+        _disk_drive(1, _STICK),
+        _disk_drive(2, _CARD_READER),
+        # A USB disk whose PnP entity was not part of the scan is ignored.
+        _disk_drive(3, r"USBSTOR\DISK&VEN_OTHER&PROD_GONE\1&0"),
+    ]
+    provider.lists["Win32_DiskDriveToDiskPartition"] = [
+        [_disk_path(1), _partition_path(1, 0)],
+        [_disk_path(1), _partition_path(1, 1)],
+        [_disk_path(3), _partition_path(3, 0)],
+    ]
+    provider.lists["Win32_LogicalDiskToPartition"] = [
+        [_partition_path(1, 0), _logical_disk_path("F:")],
+        [_partition_path(1, 1), _logical_disk_path("E:")],
+        [_partition_path(3, 0), _logical_disk_path("G:")],
+    ]
+    provider.rows[UsbStorageDeviceService._LOGICAL_DISK_WQL] = [
+        _logical_disk("E:"),
+        _logical_disk("F:"),
+        _logical_disk("G:"),
+    ]
+
+    scan = service._scan_usb_storage_devices_uncached()
+
+    # Sorted case-insensitively by instance ID; the mouse is not a storage device.
+    assert scan.device_ids == [
+        UsbDeviceId(instance_id=_CARD_READER),
+        UsbDeviceId(instance_id=_STICK),
+    ]
+    assert scan.instance_ids == {_STICK, _CARD_READER}
+    assert [v.drive_letter for v in scan.volumes_by_instance_id[_STICK]] == ["E:", "F:"]
+    # A card reader without media has a disk drive but no partitions.
+    assert scan.volumes_by_instance_id[_CARD_READER] == []
+
+
+def test_scan_volumes_returns_empty_on_wmi_error(
+    service: UsbStorageDeviceService, provider: FakeWmiProvider
+) -> None:
+    provider.raise_on_fetch = RuntimeError("wmi failed")
+    assert service._scan_usb_volumes_by_disk_uncached() == {}
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        pytest.param(None, None, id="none"),
+        pytest.param(12, 12, id="int"),
+        pytest.param("31914983424", 31914983424, id="uint64_string"),
+        pytest.param(" 12 ", 12, id="surrounding_whitespace"),
+        pytest.param("", None, id="empty"),
+        pytest.param("n/a", None, id="non_numeric"),
+    ],
+)
+def test_parse_optional_int(
+    service: UsbStorageDeviceService, value: object, expected: Optional[int]
+) -> None:
+    assert service._parse_optional_int(value) == expected
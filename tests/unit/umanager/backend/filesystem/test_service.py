@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 import pytest
@@ -11,35 +14,71 @@ from umanager.backend.filesystem import (
     ListOptions,
 )
 
+_IS_WINDOWS = sys.platform == "win32"
 
-@pytest.fixture
+if _IS_WINDOWS:
+    import win32api  # type: ignore[import-not-found]
+    import win32file  # type: ignore[import-not-found]
+
+_windows_only = pytest.mark.skipif(
+    not _IS_WINDOWS, reason="Windows-only hidden attribute semantics"
+)
+
+
+@pytest.fixture(scope="session")
 def service() -> FileSystemService:
-    """Create FileSystemService instance"""
+    """Create a shared FileSystemService instance (the service holds no state)"""
     return FileSystemService()
 
 
 def _set_windows_hidden(path: Path) -> None:
-    """Mark file as hidden on Windows using FILE_ATTRIBUTE_HIDDEN."""
-    try:
-        import win32api  # type: ignore[import-not-found]
-        import win32file  # type: ignore[import-not-found]
-    except Exception as exc:  # pragma: no cover
-        pytest.skip(f"pywin32 not available: {exc}")
+    """Mark a freshly created file as hidden on Windows using FILE_ATTRIBUTE_HIDDEN."""
+    # A new file only carries FILE_ATTRIBUTE_ARCHIVE, so there is no need to read it back first.
+    win32api.SetFileAttributes(
+        str(path), win32file.FILE_ATTRIBUTE_HIDDEN | win32file.FILE_ATTRIBUTE_ARCHIVE
+    )
+
+
+def _mkdir(path: Path, *subdirs: str) -> Path:
+    """Create path and the given direct subdirectories with plain os.mkdir calls"""
+    os.mkdir(path)
+    for name in subdirs:
+        os.mkdir(os.path.join(path, name))
+    return path
+
+
+def _make_files(root: Path, spec: dict[str, str | None]) -> None:
+    """Create files under root; None creates an empty file without touch()'s extra utime"""
+    for name, content in spec.items():
+        path = root / name
+        if content is None:
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+        else:
+            path.write_bytes(content.encode())
 
-    attrs = win32api.GetFileAttributes(str(path))
-    win32api.SetFileAttributes(str(path), attrs | win32file.FILE_ATTRIBUTE_HIDDEN)
+
+# Read-only listing tests share one tree per module instead of a fresh tmp_path each.
+@pytest.fixture(scope="module")
+def empty_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("empty")
+
+
+@pytest.fixture(scope="module")
+def sorted_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("sorted")
+    _make_files(root, {"c.txt": None, "a.txt": None, "b.txt": None})
+    return root
 
 
 class TestListDirectory:
-    def test_list_directory_empty(self, service: FileSystemService, tmp_path: Path) -> None:
+    def test_list_directory_empty(self, service: FileSystemService, empty_dir: Path) -> None:
         """Test listing empty directory"""
-        entries = service.list_directory(tmp_path)
+        entries = service.list_directory(empty_dir)
         assert entries == []
 
     def test_list_directory_with_files(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test listing directory with files"""
-        (tmp_path / "file1.txt").touch()
-        (tmp_path / "file2.txt").touch()
+        _make_files(tmp_path, {"file1.txt": None, "file2.txt": None})
 
         entries = service.list_directory(tmp_path)
         assert len(entries) == 2
@@ -48,13 +87,14 @@ class TestListDirectory:
 
     def test_list_directory_with_subdirs(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test listing directory with subdirectories"""
-        (tmp_path / "dir1").mkdir()
-        (tmp_path / "dir2").mkdir()
+        _mkdir(tmp_path / "dir1")
+        _mkdir(tmp_path / "dir2")
 
         entries = service.list_directory(tmp_path)
         assert len(entries) == 2
         assert all(e.is_dir for e in entries)
 
+    @_windows_only
     def test_list_directory_exclude_hidden(
         self, service: FileSystemService, tmp_path: Path
     ) -> None:
@@ -68,6 +108,7 @@ class TestListDirectory:
         assert len(entries) == 1
         assert entries[0].name == "visible.txt"
 
+    @_windows_only
     def test_list_directory_include_hidden(
         self, service: FileSystemService, tmp_path: Path
     ) -> None:
@@ -95,13 +136,9 @@ class TestListDirectory:
         with pytest.raises(NotADirectoryError):
             service.list_directory(file_path)
 
-    def test_list_directory_sorted(self, service: FileSystemService, tmp_path: Path) -> None:
+    def test_list_directory_sorted(self, service: FileSystemService, sorted_dir: Path) -> None:
         """Test that returned entries are sorted by name"""
-        (tmp_path / "c.txt").touch()
-        (tmp_path / "a.txt").touch()
-        (tmp_path / "b.txt").touch()
-
-        entries = service.list_directory(tmp_path)
+        entries = service.list_directory(sorted_dir)
         names = [e.name for e in entries]
         assert names == ["a.txt", "b.txt", "c.txt"]
 
@@ -115,23 +152,25 @@ class TestTouchFile:
         assert file_path.exists()
         assert result == file_path
 
-    def test_touch_file_exist_ok_true(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that exist_ok=True does not overwrite existing file"""
+    @pytest.mark.parametrize(
+        ("exist_ok", "expect_raise"),
+        [
+            (True, nullcontext()),
+            (False, pytest.raises(FileExistsError)),
+        ],
+    )
+    def test_touch_file_exist_ok(
+        self, service: FileSystemService, tmp_path: Path, exist_ok: bool, expect_raise
+    ) -> None:
+        """Test that an existing file is kept with exist_ok=True and rejected otherwise"""
         file_path = tmp_path / "test.txt"
         file_path.write_text("original content")
 
-        service.touch_file(file_path, exist_ok=True)
+        with expect_raise:
+            service.touch_file(file_path, exist_ok=exist_ok)
 
         assert file_path.read_text() == "original content"
 
-    def test_touch_file_exist_ok_false(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that exist_ok=False raises exception"""
-        file_path = tmp_path / "test.txt"
-        file_path.touch()
-
-        with pytest.raises(FileExistsError):
-            service.touch_file(file_path, exist_ok=False)
-
     def test_touch_file_with_parents(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test creating parent directories"""
         file_path = tmp_path / "subdir1" / "subdir2" / "test.txt"
@@ -161,34 +200,36 @@ class TestCopyPath:
         assert dst.read_text() == "content"
         assert result == dst
 
-    def test_copy_file_overwrite_false(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=False raises exception"""
-        src = tmp_path / "source.txt"
-        dst = tmp_path / "dest.txt"
-        src.write_text("source content")
-        dst.write_text("dest content")
-
-        with pytest.raises(FileExistsError):
-            service.copy_path(src, dst, options=CopyOptions(overwrite=False))
-
-    def test_copy_file_overwrite_true(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=True overwrites file"""
+    @pytest.mark.parametrize(
+        ("overwrite", "expect_content", "expect_raise"),
+        [
+            (False, "dest content", pytest.raises(FileExistsError)),
+            (True, "source content", nullcontext()),
+        ],
+    )
+    def test_copy_file_overwrite(
+        self,
+        service: FileSystemService,
+        tmp_path: Path,
+        overwrite: bool,
+        expect_content: str,
+        expect_raise,
+    ) -> None:
+        """Test that overwrite controls whether an existing file is replaced"""
         src = tmp_path / "source.txt"
         dst = tmp_path / "dest.txt"
         src.write_text("source content")
         dst.write_text("dest content")
 
-        service.copy_path(src, dst, options=CopyOptions(overwrite=True))
+        with expect_raise:
+            service.copy_path(src, dst, options=CopyOptions(overwrite=overwrite))
 
-        assert dst.read_text() == "source content"
+        assert dst.read_text() == expect_content
 
     def test_copy_directory_recursive(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test recursive copying directory"""
-        src_dir = tmp_path / "source_dir"
-        src_dir.mkdir()
-        (src_dir / "file1.txt").write_text("content1")
-        (src_dir / "subdir").mkdir()
-        (src_dir / "subdir" / "file2.txt").write_text("content2")
+        src_dir = _mkdir(tmp_path / "source_dir", "subdir")
+        _make_files(src_dir, {"file1.txt": "content1", "subdir/file2.txt": "content2"})
 
         dst_dir = tmp_path / "dest_dir"
         service.copy_path(src_dir, dst_dir, options=CopyOptions(recursive=True))
@@ -198,8 +239,7 @@ class TestCopyPath:
 
     def test_copy_directory_non_recursive(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test that recursive=False raises exception"""
-        src_dir = tmp_path / "source_dir"
-        src_dir.mkdir()
+        src_dir = _mkdir(tmp_path / "source_dir")
         dst_dir = tmp_path / "dest_dir"
 
         with pytest.raises(IsADirectoryError):
@@ -207,13 +247,11 @@ class TestCopyPath:
 
     def test_copy_directory_merge(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test merging directories when copying"""
-        src_dir = tmp_path / "source_dir"
-        src_dir.mkdir()
-        (src_dir / "file1.txt").write_text("content1")
+        src_dir = _mkdir(tmp_path / "source_dir")
+        _make_files(src_dir, {"file1.txt": "content1"})
 
-        dst_dir = tmp_path / "dest_dir"
-        dst_dir.mkdir()
-        (dst_dir / "file2.txt").write_text("content2")
+        dst_dir = _mkdir(tmp_path / "dest_dir")
+        _make_files(dst_dir, {"file2.txt": "content2"})
 
         service.copy_path(src_dir, dst_dir, options=CopyOptions(recursive=True))
 
@@ -254,37 +292,41 @@ class TestMovePath:
         assert dst.read_text() == "content"
         assert result == dst
 
-    def test_move_file_overwrite_false(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=False raises exception"""
-        src = tmp_path / "source.txt"
-        dst = tmp_path / "dest.txt"
-        src.write_text("source content")
-        dst.write_text("dest content")
-
-        with pytest.raises(FileExistsError):
-            service.move_path(src, dst, overwrite=False)
-
-    def test_move_file_overwrite_true(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=True overwrites file"""
+    @pytest.mark.parametrize(
+        ("overwrite", "expect_content", "expect_src_exists", "expect_raise"),
+        [
+            (False, "dest content", True, pytest.raises(FileExistsError)),
+            (True, "source content", False, nullcontext()),
+        ],
+    )
+    def test_move_file_overwrite(
+        self,
+        service: FileSystemService,
+        tmp_path: Path,
+        overwrite: bool,
+        expect_content: str,
+        expect_src_exists: bool,
+        expect_raise,
+    ) -> None:
+        """Test that overwrite controls whether an existing file is replaced"""
         src = tmp_path / "source.txt"
         dst = tmp_path / "dest.txt"
         src.write_text("source content")
         dst.write_text("dest content")
 
-        service.move_path(src, dst, overwrite=True)
+        with expect_raise:
+            service.move_path(src, dst, overwrite=overwrite)
 
-        assert not src.exists()
-        assert dst.read_text() == "source content"
+        assert src.exists() == expect_src_exists
+        assert dst.read_text() == expect_content
 
     def test_move_directory_merge(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test merging directories when moving"""
-        src_dir = tmp_path / "source_dir"
-        src_dir.mkdir()
-        (src_dir / "file1.txt").write_text("content1")
+        src_dir = _mkdir(tmp_path / "source_dir")
+        _make_files(src_dir, {"file1.txt": "content1"})
 
-        dst_dir = tmp_path / "dest_dir"
-        dst_dir.mkdir()
-        (dst_dir / "file2.txt").write_text("content2")
+        dst_dir = _mkdir(tmp_path / "dest_dir")
+        _make_files(dst_dir, {"file2.txt": "content2"})
 
         service.move_path(src_dir, dst_dir)
 
@@ -324,27 +366,33 @@ class TestRename:
         assert (tmp_path / "new_name.txt").exists()
         assert result == tmp_path / "new_name.txt"
 
-    def test_rename_overwrite_false(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=False raises exception"""
-        src = tmp_path / "file1.txt"
-        dst = tmp_path / "file2.txt"
-        src.write_text("content1")
-        dst.write_text("content2")
-
-        with pytest.raises(FileExistsError):
-            service.rename(src, "file2.txt", overwrite=False)
-
-    def test_rename_overwrite_true(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test that overwrite=True overwrites"""
+    @pytest.mark.parametrize(
+        ("overwrite", "expect_content", "expect_src_exists", "expect_raise"),
+        [
+            (False, "content2", True, pytest.raises(FileExistsError)),
+            (True, "content1", False, nullcontext()),
+        ],
+    )
+    def test_rename_overwrite(
+        self,
+        service: FileSystemService,
+        tmp_path: Path,
+        overwrite: bool,
+        expect_content: str,
+        expect_src_exists: bool,
+        expect_raise,
+    ) -> None:
+        """Test that overwrite controls whether an existing target is replaced"""
         src = tmp_path / "file1.txt"
         dst = tmp_path / "file2.txt"
         src.write_text("content1")
         dst.write_text("content2")
 
-        service.rename(src, "file2.txt", overwrite=True)
+        with expect_raise:
+            service.rename(src, "file2.txt", overwrite=overwrite)
 
-        assert not src.exists()
-        assert dst.read_text() == "content1"
+        assert src.exists() == expect_src_exists
+        assert dst.read_text() == expect_content
 
 
 class TestDelete:
@@ -357,44 +405,45 @@ class TestDelete:
 
         assert not file_path.exists()
 
-    def test_delete_directory_recursive(self, service: FileSystemService, tmp_path: Path) -> None:
-        """Test recursive deletion of directory"""
-        dir_path = tmp_path / "test_dir"
-        dir_path.mkdir()
-        (dir_path / "file.txt").touch()
-        (dir_path / "subdir").mkdir()
-
-        service.delete(dir_path, options=DeleteOptions(recursive=True))
-
-        assert not dir_path.exists()
-
-    def test_delete_directory_non_recursive(
-        self, service: FileSystemService, tmp_path: Path
-    ) -> None:
-        """Test that recursive=False raises exception"""
-        dir_path = tmp_path / "test_dir"
-        dir_path.mkdir()
-
-        with pytest.raises(IsADirectoryError):
-            service.delete(dir_path, options=DeleteOptions(recursive=False))
-
-    def test_delete_nonexistent_force_false(
-        self, service: FileSystemService, tmp_path: Path
+    @pytest.mark.parametrize(
+        ("recursive", "expect_exists", "expect_raise"),
+        [
+            (True, False, nullcontext()),
+            (False, True, pytest.raises(IsADirectoryError)),
+        ],
+    )
+    def test_delete_directory_recursive(
+        self,
+        service: FileSystemService,
+        tmp_path: Path,
+        recursive: bool,
+        expect_exists: bool,
+        expect_raise,
     ) -> None:
-        """Test that deleting non-existent path with force=False raises exception"""
-        file_path = tmp_path / "nonexistent.txt"
-
-        with pytest.raises(FileNotFoundError):
-            service.delete(file_path, options=DeleteOptions(force=False))
-
-    def test_delete_nonexistent_force_true(
-        self, service: FileSystemService, tmp_path: Path
+        """Test that non-recursive deletion of a directory raises exception"""
+        dir_path = _mkdir(tmp_path / "test_dir", "subdir")
+        _make_files(dir_path, {"file.txt": None})
+
+        with expect_raise:
+            service.delete(dir_path, options=DeleteOptions(recursive=recursive))
+
+        assert dir_path.exists() == expect_exists
+
+    @pytest.mark.parametrize(
+        ("force", "expect_raise"),
+        [
+            (False, pytest.raises(FileNotFoundError)),
+            (True, nullcontext()),
+        ],
+    )
+    def test_delete_nonexistent_force(
+        self, service: FileSystemService, tmp_path: Path, force: bool, expect_raise
     ) -> None:
-        """Test that deleting non-existent path with force=True succeeds"""
+        """Test that deleting non-existent path only raises exception with force=False"""
         file_path = tmp_path / "nonexistent.txt"
 
-        service.delete(file_path, options=DeleteOptions(force=True))
-        # Should not raise exception
+        with expect_raise:
+            service.delete(file_path, options=DeleteOptions(force=force))
 
 
 class TestPathExists:
@@ -433,8 +482,7 @@ class TestFileEntry:
 
     def test_directory_entry_attributes(self, service: FileSystemService, tmp_path: Path) -> None:
         """Test directory FileEntry attributes"""
-        dir_path = tmp_path / "test_dir"
-        dir_path.mkdir()
+        _mkdir(tmp_path / "test_dir")
 
         entries = service.list_directory(tmp_path)
         entry = entries[0]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+from device_fakes import ID_A, ID_B, DeviceServices, FakeBaseDeviceService, FakeStorageDeviceService
+from PySide6 import QtCore
+
+from umanager.ui.states import MainAreaStateManager
+
+
+@pytest.fixture
+def device_services() -> DeviceServices:
+    """Fake services with a plain USB device (A) and a USB storage device (B)."""
+    base = FakeBaseDeviceService()
+    storage = FakeStorageDeviceService(base)
+
+    base.add_device(ID_A.instance_id, product="A")
+    base.add_device(ID_B.instance_id, product="B")
+    storage.add_storage(ID_B.instance_id)
+    return base, storage
+
+
+@pytest.fixture
+def main_area_manager(
+    qapp: QtCore.QCoreApplication, device_services: DeviceServices
+) -> MainAreaStateManager:
+    base, storage = device_services
+    return MainAreaStateManager(qapp, base, storage)
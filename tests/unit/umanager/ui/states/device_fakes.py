@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from umanager.backend.device import (
+    DeviceEjectResult,
+    UsbBaseDeviceInfo,
+    UsbBaseDeviceProtocol,
+    UsbDeviceId,
+    UsbStorageDeviceInfo,
+    UsbStorageDeviceProtocol,
+)
+
+ID_A = UsbDeviceId(instance_id="A")
+ID_B = UsbDeviceId(instance_id="B")
+
+
+class FakeBaseDeviceService(UsbBaseDeviceProtocol):
+    def __init__(self) -> None:
+        self._ids: list[UsbDeviceId] = []
+        self._info: dict[str, UsbBaseDeviceInfo] = {}
+        self.refresh_calls = 0
+        self.raise_on_refresh: Optional[Exception] = None
+
+    def add_device(self, instance_id: str, *, product: str = "Device") -> UsbBaseDeviceInfo:
+        dev_id = UsbDeviceId(instance_id=instance_id)
+        info = UsbBaseDeviceInfo(id=dev_id, product=product)
+        if instance_id not in self._info:
+            self._ids.append(dev_id)
+        self._info[instance_id] = info
+        return info
+
+    def refresh(self) -> None:
+        self.refresh_calls += 1
+        if self.raise_on_refresh is not None:
+            raise self.raise_on_refresh
+
+    def get_base_device_info(self, device_id: UsbDeviceId) -> UsbBaseDeviceInfo:
+        return self._info[device_id.instance_id]
+
+    def list_base_device_ids(self) -> list[UsbDeviceId]:
+        return list(self._ids)
+
+
+class FakeStorageDeviceService(UsbStorageDeviceProtocol):
+    def __init__(self, base: FakeBaseDeviceService) -> None:
+        self._base = base
+        self._storage_ids: list[UsbDeviceId] = []
+        self._storage_id_set: set[str] = set()
+        self.refresh_calls = 0
+        self.raise_on_refresh: Optional[Exception] = None
+        self.raise_on_get_info: set[str] = set()
+
+        self.eject_calls: list[str] = []
+        self.next_eject_result: Optional[DeviceEjectResult] = None
+        self.raise_on_eject: Optional[Exception] = None
+
+    def add_storage(self, instance_id: str) -> None:
+        if instance_id in self._storage_id_set:
+            return
+        self._storage_id_set.add(instance_id)
+        self._storage_ids.append(UsbDeviceId(instance_id=instance_id))
+
+    def refresh(self) -> None:
+        self.refresh_calls += 1
+        if self.raise_on_refresh is not None:
+            raise self.raise_on_refresh
+
+    def get_storage_device_info(self, device_id: UsbDeviceId) -> UsbStorageDeviceInfo:
+        if device_id.instance_id in self.raise_on_get_info:
+            raise RuntimeError("storage info failed")
+        base_info = self._base.get_base_device_info(device_id)
+        return UsbStorageDeviceInfo(base=base_info)
+
+    def list_storage_device_ids(self) -> list[UsbDeviceId]:
+        return list(self._storage_ids)
+
+    def eject_storage_device(self, device_id: UsbDeviceId) -> DeviceEjectResult:
+        self.eject_calls.append(device_id.instance_id)
+        if self.raise_on_eject is not None:
+            raise self.raise_on_eject
+        if self.next_eject_result is not None:
+            return self.next_eject_result
+        return DeviceEjectResult(
+            success=False,
+            attempted_instance_id=device_id.instance_id,
+            config_ret=1,
+        )
+
+
+DeviceServices = tuple[FakeBaseDeviceService, FakeStorageDeviceService]
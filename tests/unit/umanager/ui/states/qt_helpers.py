@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any, Optional
+
+from PySide6 import QtCore
+
+
+def wait_until(condition: Callable[[], bool], *, timeout_ms: int = 2000) -> None:
+    if condition():
+        return
+
+    deadline = time.monotonic() + timeout_ms / 1000
+    # The timer has no slot; its timeout event only wakes the blocking processEvents() below
+    # once the deadline has passed. Queued signals from worker threads wake it otherwise.
+    wakeup = QtCore.QTimer()
+    wakeup.setSingleShot(True)
+    wakeup.start(timeout_ms)
+    try:
+        while not condition() and time.monotonic() < deadline:
+            QtCore.QCoreApplication.processEvents(
+                QtCore.QEventLoop.ProcessEventsFlag.WaitForMoreEvents
+            )
+    finally:
+        wakeup.stop()
+
+    assert condition(), "timed out waiting for condition"
+
+
+class SignalCatcher:
+    def __init__(self, signal: Any, predicate: Optional[Callable[..., bool]] = None) -> None:
+        self._signal = signal
+        self._predicate = predicate
+        # Counts every emission, whether or not it matches the predicate.
+        self.count = 0
+        # Only emissions matching the predicate are kept (all of them without one).
+        self.captured: list[tuple[Any, ...]] = []
+        signal.connect(self._handler)
+
+    def _handler(self, *args: Any) -> None:
+        self.count += 1
+        if self._predicate is None or self._predicate(*args):
+            self.captured.append(args)
+
+    def disconnect(self) -> None:
+        self._signal.disconnect(self._handler)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any
 
-import pytest
 from PySide6 import QtCore
+from qt_helpers import wait_until
 
 from umanager.backend.filesystem import (
     CopyOptions,
@@ -202,14 +202,6 @@ class FakeFileSystem(FileSystemProtocol):
         )
 
 
-@pytest.fixture(scope="module")
-def qapp() -> QtCore.QCoreApplication:
-    app = QtCore.QCoreApplication.instance()
-    if app is None:
-        app = QtCore.QCoreApplication([])
-    return app
-
-
 class SignalCatcher:
     def __init__(self, signal: Any) -> None:
         self._signal = signal
@@ -223,30 +215,6 @@ class SignalCatcher:
         self._signal.disconnect(self._handler)
 
 
-def wait_until(condition: Callable[[], bool], *, timeout_ms: int = 2000) -> None:
-    loop = QtCore.QEventLoop()
-    timer = QtCore.QTimer()
-    timer.setSingleShot(True)
-    timer.timeout.connect(loop.quit)
-    timer.start(timeout_ms)
-
-    poll = QtCore.QTimer()
-    poll.setInterval(0)
-
-    def check() -> None:
-        if condition():
-            loop.quit()
-
-    poll.timeout.connect(check)
-    poll.start()
-
-    while timer.isActive() and not condition():
-        loop.exec()
-
-    poll.stop()
-    assert condition(), "timed out waiting for condition"
-
-
 def make_manager(
     app: QtCore.QCoreApplication,
 ) -> tuple[FileManagerStateManager, FakeFileSystem, Path, Path]:
@@ -1,35 +1,57 @@
-from umanager.util.size_format import format_size, to_size_parts
-
-
-def test_to_size_parts_none_is_zero() -> None:
-    parts = to_size_parts(None)
-    assert parts.bytes == 0
-    assert parts.value == 0
-    assert parts.unit == "B"
-
-
-def test_to_size_parts_bytes() -> None:
-    parts = to_size_parts(999)
-    assert parts.unit == "B"
-    assert parts.value == 999
-
+from typing import Any
 
-def test_to_size_parts_kb_boundary_binary() -> None:
-    parts = to_size_parts(1024)
-    assert parts.unit == "KB"
-    assert parts.value == 1
-
-
-def test_to_size_parts_mb_boundary_binary() -> None:
-    parts = to_size_parts(1024**2)
-    assert parts.unit == "MB"
-    assert parts.value == 1
-
-
-def test_format_size_strips_trailing_dot_zero() -> None:
-    assert format_size(12 * 1024**3, decimals=1) == "12 GB"
+import pytest
 
+from umanager.util.size_format import format_size, to_size_parts
 
-def test_format_size_small_value_keeps_one_decimal_by_default() -> None:
-    # 1.5 KB
-    assert format_size(1536) == "1.5 KB"
+_KB, _MB, _GB = 1024, 1024**2, 1024**3
+_EB = 1024**6
+
+
+@pytest.mark.parametrize(
+    ("num_bytes", "expected_bytes", "unit", "value"),
+    [
+        pytest.param(None, 0, "B", 0, id="none_is_zero"),
+        pytest.param(999, 999, "B", 999, id="bytes"),
+        pytest.param(_KB, _KB, "KB", 1, id="kb_boundary_binary"),
+        pytest.param(_MB, _MB, "MB", 1, id="mb_boundary_binary"),
+        pytest.param(_EB, _EB, "EB", 1, id="eb_boundary_binary"),
+        # Nothing above EB: larger values stay in EB instead of running off the unit table.
+        pytest.param(1024 * _EB, 1024 * _EB, "EB", 1024, id="above_eb_clamps_binary"),
+    ],
+)
+def test_to_size_parts(num_bytes: int | None, expected_bytes: int, unit: str, value: float) -> None:
+    parts = to_size_parts(num_bytes)
+    assert parts.bytes == expected_bytes
+    assert parts.unit == unit
+    assert parts.value == value
+
+
+@pytest.mark.parametrize(
+    ("num_bytes", "unit", "value"),
+    [
+        pytest.param(999, "B", 999, id="bytes"),
+        pytest.param(1000, "KB", 1, id="kb_boundary_decimal"),
+        pytest.param(10**6, "MB", 1, id="mb_boundary_decimal"),
+        pytest.param(10**18, "EB", 1, id="eb_boundary_decimal"),
+        pytest.param(10**21, "EB", 1000, id="above_eb_clamps_decimal"),
+    ],
+)
+def test_to_size_parts_decimal(num_bytes: int, unit: str, value: float) -> None:
+    parts = to_size_parts(num_bytes, system="decimal")
+    assert parts.bytes == num_bytes
+    assert parts.unit == unit
+    assert parts.value == value
+
+
+@pytest.mark.parametrize(
+    ("num_bytes", "kwargs", "expected"),
+    [
+        pytest.param(12 * _GB, {"decimals": 1}, "12 GB", id="strips_trailing_dot_zero"),
+        # 1.5 KB
+        pytest.param(1536, {}, "1.5 KB", id="small_value_keeps_one_decimal_by_default"),
+        pytest.param(1500, {"system": "decimal"}, "1.5 KB", id="decimal_system"),
+    ],
+)
+def test_format_size(num_bytes: int, kwargs: dict[str, Any], expected: str) -> None:
+    assert format_size(num_bytes, **kwargs) == expected